@@ -3,15 +3,20 @@ RAW_HOPPER - Configurable RAW Photo Ingest Tool for Capture One
 A Tkinter-based GUI application for ingesting RAW photos into a Capture One file structure.
 """
 
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+import io
 import json
 import os
 import shutil
+import struct
+import tarfile
 import datetime
+import errno
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 import threading
+import time
+import queue
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 
 try:
     import exifread
@@ -19,12 +24,54 @@ try:
 except ImportError:
     EXIF_AVAILABLE = False
 
+try:
+    import piexif
+    PIEXIF_AVAILABLE = True
+except ImportError:
+    PIEXIF_AVAILABLE = False
+
 try:
     import win32api
     WIN32_AVAILABLE = True
 except ImportError:
     WIN32_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Tkinter is imported on first use by _import_tkinter() so HopperLogic can be
+# used headless (tests, scripts) without loading Tk
+tk = ttk = filedialog = messagebox = None
+
+
+def _import_tkinter() -> None:
+    """Import the Tkinter modules used by HopperUI into module globals."""
+    global tk, ttk, filedialog, messagebox
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=4 if indent else None).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class SourceNotRemovedError(Exception):
+    """A file was copied to its destination but the original remains."""
+
 
 class HopperLogic:
     """Core logic for RAW photo ingestion."""
@@ -38,18 +85,63 @@ class HopperLogic:
         'month_format': '%Y-%m_%B',
         'session_format': 'Session_{month_name}',
         'file_extensions': '.RAF, .JPG',
+        'use_mtime_only': False,
     }
 
+    # Bytes read from the start of each file when parsing EXIF
+    EXIF_HEADER_BYTES = 128 * 1024
+
+    # Concurrent EXIF header reads during the planning pass
+    EXIF_WORKERS = 32
+
+    # Maximum files read or moved at once by the ingest pipeline
+    PIPELINE_DEPTH = 64
+
+    # Chunk size for buffered copies between volumes
+    COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+    # Minimum seconds between progress callbacks (~30 Hz)
+    PROGRESS_INTERVAL = 1 / 30
+
+    # Seconds a drive listing is reused before querying Windows again
+    DRIVES_CACHE_SECONDS = 5
+
+    # Maximum number of EXIF dates kept in the sidecar cache file
+    EXIF_CACHE_LIMIT = 50000
+
+    # Maximum number of ingested files remembered in the ledger file
+    LEDGER_LIMIT = 50000
+
+    # strftime directives finer than a day; folder formats using any of
+    # these can't share one cached path per calendar day
+    TIME_DIRECTIVES = ('%H', '%I', '%M', '%S', '%p', '%f', '%X', '%c',
+                       '%R', '%T', '%r', '%s')
+
     def __init__(self, config_path: str = 'raw_hopper_config.json'):
         self.config_path = config_path
+        self._ext_cache = None
+        self._session_cache = {}
+        self._capture_contents = {}
+        self._template_tar = None
+        self._path_cache = {}
+        self._drives_cache = None
         self.config = self.load_config()
+        self.exif_cache_path = os.path.join(
+            os.path.dirname(config_path), 'raw_hopper_exif_cache.json'
+        )
+        self._exif_cache = self.load_exif_cache()
+        self.ledger_path = os.path.join(
+            os.path.dirname(config_path), 'raw_hopper_ledger.json'
+        )
+        self._ledger = self.load_ledger()
 
     def load_config(self) -> Dict:
         """Load configuration from JSON file."""
+        self._ext_cache = None
         if os.path.exists(self.config_path):
             try:
-                with open(self.config_path, 'r') as f:
-                    loaded = json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    loaded = _json_loads(f.read())
                     # Merge with defaults to ensure all keys exist
                     config = self.DEFAULT_CONFIG.copy()
                     config.update(loaded)
@@ -61,37 +153,110 @@ class HopperLogic:
 
     def save_config(self) -> None:
         """Save configuration to JSON file."""
+        self._ext_cache = None
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            with open(self.config_path, 'wb') as f:
+                f.write(_json_dumps(self.config, indent=True))
         except Exception as e:
             print(f"Error saving config: {e}")
 
-    def get_drives(self) -> List[Tuple[str, str]]:
+    def load_exif_cache(self) -> Dict[Tuple[str, int, int], datetime.datetime]:
+        """Load cached EXIF dates from the sidecar JSON file."""
+        cache = {}
+        if os.path.exists(self.exif_cache_path):
+            try:
+                with open(self.exif_cache_path, 'rb') as f:
+                    entries = _json_loads(f.read())
+                for path, mtime_ns, size, date_str in entries:
+                    cache[(path, mtime_ns, size)] = (
+                        datetime.datetime.fromisoformat(date_str)
+                    )
+            except Exception as e:
+                print(f"Error loading EXIF cache: {e}")
+                return {}
+        return cache
+
+    def save_exif_cache(self) -> None:
+        """Save the most recent cached EXIF dates to the sidecar JSON file."""
+        entries = list(self._exif_cache.items())[-self.EXIF_CACHE_LIMIT:]
+        try:
+            with open(self.exif_cache_path, 'wb') as f:
+                f.write(_json_dumps(
+                    [[path, mtime_ns, size, date.isoformat()]
+                     for (path, mtime_ns, size), date in entries]
+                ))
+        except Exception as e:
+            print(f"Error saving EXIF cache: {e}")
+
+    def load_ledger(self) -> Dict[str, None]:
+        """
+        Load keys of already ingested files from the ledger JSON file.
+        A dict is used as an insertion-ordered set so the oldest keys can be
+        dropped first.
+        """
+        if os.path.exists(self.ledger_path):
+            try:
+                with open(self.ledger_path, 'rb') as f:
+                    return dict.fromkeys(_json_loads(f.read()))
+            except Exception as e:
+                print(f"Error loading ledger: {e}")
+        return {}
+
+    def save_ledger(self) -> None:
+        """Save the most recent ingested file keys to the ledger JSON file."""
+        keys = list(self._ledger)[-self.LEDGER_LIMIT:]
+        try:
+            with open(self.ledger_path, 'wb') as f:
+                f.write(_json_dumps(keys))
+        except Exception as e:
+            print(f"Error saving ledger: {e}")
+
+    def ledger_key(self, entry: os.DirEntry) -> str:
+        """
+        Identify a source file across runs, including copies of it.
+        The inode is left out so a file copied back to the card (which keeps
+        its mtime) still matches; the name separates burst shots that share
+        size and mtime.
+        """
+        st = entry.stat()
+        return f"{entry.name}:{st.st_mtime_ns}:{st.st_size}"
+
+    def get_drives(self, use_cache: bool = True) -> List[Tuple[str, str]]:
         """
         Get all available drives with their volume labels.
         Returns list of tuples: (drive_letter, volume_label)
+        Results are reused for DRIVES_CACHE_SECONDS unless use_cache is False.
         """
         if not WIN32_AVAILABLE:
             return [('C:\\', 'Local Drive')]
 
+        if use_cache and self._drives_cache is not None:
+            cached_at, cached_drives = self._drives_cache
+            if time.monotonic() - cached_at < self.DRIVES_CACHE_SECONDS:
+                return list(cached_drives)
+
         drives = []
         try:
-            for drive_letter in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-                drive_path = f'{drive_letter}:\\'
+            # Only query drives that exist (NUL-separated root paths)
+            drive_strings = win32api.GetLogicalDriveStrings()
+            for drive_path in drive_strings.split('\x00'):
+                if not drive_path:
+                    continue
                 try:
                     volume_info = win32api.GetVolumeInformation(drive_path)
                     if volume_info[0]:
                         volume_label = volume_info[0]
                     else:
-                        volume_label = f'Drive_{drive_letter}'
+                        volume_label = f'Drive_{drive_path[0]}'
                     drives.append((drive_path, volume_label))
                 except Exception:
+                    # Present but not ready, e.g. an empty card reader
                     continue
         except Exception as e:
             print(f"Error getting drives: {e}")
 
-        return drives
+        self._drives_cache = (time.monotonic(), drives)
+        return list(drives)
 
     def resolve_volume_label_to_drive(self, volume_label: str) -> Optional[str]:
         """Resolve a volume label to its current drive letter."""
@@ -101,45 +266,140 @@ class HopperLogic:
                 return drive_path
         return None
 
-    def get_exif_date(self, file_path: str) -> Optional[datetime.datetime]:
-        """Extract date from EXIF data."""
-        if not EXIF_AVAILABLE:
-            # Fallback to file modification time
-            return datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
-
+    def get_exif_date(self, file_path: str,
+                      stat_result: Optional[os.stat_result] = None
+                      ) -> Optional[datetime.datetime]:
+        """
+        Extract date from EXIF data, falling back to file modification time.
+        Results are cached by (path, mtime, size) so unchanged files are not
+        re-parsed on later runs. Pass stat_result (e.g. from DirEntry.stat())
+        to avoid another stat call.
+        """
+        st = stat_result
+        if st is None:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return None
+
+        # Cameras set mtime to capture time, so skipping EXIF is an opt-in
+        # shortcut that needs nothing beyond the stat above
+        exif_available = PIEXIF_AVAILABLE or EXIF_AVAILABLE
+        if not exif_available or self.config.get('use_mtime_only'):
+            return datetime.datetime.fromtimestamp(st.st_mtime)
+
+        key = (file_path, st.st_mtime_ns, st.st_size)
+        cached = self._exif_cache.get(key)
+        if cached is not None:
+            return cached
+
+        date = None
         try:
+            # Only the header is needed for the date; reading a bounded
+            # prefix keeps the parsers away from embedded previews and strips
             with open(file_path, 'rb') as f:
-                tags = exifread.process_file(f, stop_tag='DateTimeOriginal')
-                if 'EXIF DateTimeOriginal' in tags:
-                    date_str = str(tags['EXIF DateTimeOriginal'])
-                    dt = datetime.datetime.strptime(
-                        date_str, '%Y:%m:%d %H:%M:%S'
-                    )
-                    return dt
+                header = f.read(self.EXIF_HEADER_BYTES)
+            date = self.parse_exif_date(header)
         except Exception as e:
             print(f"Error reading EXIF from {file_path}: {e}")
+            # Read errors may be transient (e.g. EIO on a flaky card
+            # reader), so this fallback is not cached
+            return datetime.datetime.fromtimestamp(st.st_mtime)
 
-        # Fallback to file modification time
-        try:
-            return datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
-        except Exception:
-            return None
+        if date is None:
+            # Fallback to file modification time
+            date = datetime.datetime.fromtimestamp(st.st_mtime)
+
+        self._exif_cache[key] = date
+        return date
+
+    def parse_exif_date(self, header: bytes) -> Optional[datetime.datetime]:
+        """
+        Parse DateTimeOriginal from the first bytes of an image file.
+        Tries piexif first (JPEG, RAF and TIFF-based RAWs), then exifread.
+        """
+        if PIEXIF_AVAILABLE:
+            try:
+                exif = piexif.load(self.find_exif_block(header))['Exif']
+                raw = exif.get(piexif.ExifIFD.DateTimeOriginal)
+                if raw:
+                    date_str = raw.decode('ascii').strip('\x00 ')
+                    return datetime.datetime.strptime(
+                        date_str, '%Y:%m:%d %H:%M:%S'
+                    )
+            except Exception:
+                # Unsupported container or IFD past the header; try exifread
+                pass
+
+        if EXIF_AVAILABLE:
+            tags = exifread.process_file(
+                io.BytesIO(header), stop_tag='DateTimeOriginal', details=False
+            )
+            if 'EXIF DateTimeOriginal' in tags:
+                date_str = str(tags['EXIF DateTimeOriginal'])
+                return datetime.datetime.strptime(
+                    date_str, '%Y:%m:%d %H:%M:%S'
+                )
+
+        return None
+
+    def find_exif_block(self, header: bytes) -> bytes:
+        """
+        Return the part of header that piexif can parse on its own.
+        piexif walks every JPEG segment up to the image data, which usually
+        lies past the header prefix, so the Exif APP1 segment is cut out
+        here instead. RAF files embed such a JPEG at an offset given in
+        their header; TIFF-based RAWs are returned unchanged.
+        """
+        start = 0
+        if header.startswith(b'FUJIFILMCCD-RAW'):
+            start = struct.unpack('>I', header[84:88])[0]
+        if header[start:start + 2] != b'\xff\xd8':
+            return header
+
+        pos = start + 2
+        while pos + 4 <= len(header) and header[pos] == 0xff:
+            marker = header[pos + 1]
+            length = struct.unpack('>H', header[pos + 2:pos + 4])[0]
+            if marker == 0xe1 and header[pos + 4:pos + 10] == b'Exif\x00\x00':
+                return header[pos + 4:pos + 2 + length]
+            if marker == 0xda:  # Start of scan: no Exif segment
+                break
+            pos += 2 + length
+        raise ValueError("No Exif segment in header")
 
     def construct_path(self, date: datetime.datetime) -> Tuple[str, str, str]:
         """
         Construct year folder, month folder, and session name based on patterns.
         Returns: (year_folder, month_folder, session_name)
+        Results are memoized per calendar day and set of formats, since
+        strftime is comparatively slow; formats with time directives are
+        memoized per timestamp instead.
         """
-        year_folder = date.strftime(self.config['year_format'])
-        month_folder = date.strftime(self.config['month_format'])
+        year_format = self.config['year_format']
+        month_format = self.config['month_format']
+        session_format = self.config['session_format']
+        formats = (year_format, month_format, session_format)
+        if any(directive in fmt for fmt in formats
+               for directive in self.TIME_DIRECTIVES):
+            key = formats + (date,)
+        else:
+            key = formats + (date.year, date.month, date.day)
+        cached = self._path_cache.get(key)
+        if cached is not None:
+            return cached
+
+        year_folder = date.strftime(year_format)
+        month_folder = date.strftime(month_format)
 
         # For session format, replace {month_name} with full month name
-        session_format = self.config['session_format']
         session_name = session_format.replace(
             '{month_name}', date.strftime('%B')
         )
 
-        return year_folder, month_folder, session_name
+        result = (year_folder, month_folder, session_name)
+        self._path_cache[key] = result
+        return result
 
     def get_file_extensions(self) -> List[str]:
         """Parse file extensions from config."""
@@ -147,18 +407,79 @@ class HopperLogic:
         extensions = [ext.strip().upper() for ext in ext_string.split(',')]
         return extensions
 
+    def get_extension_set(self) -> FrozenSet[str]:
+        """
+        Cached set of file extensions for O(1) membership checks.
+        Rebuilt whenever the configured extension string changes.
+        """
+        ext_string = self.config['file_extensions']
+        if self._ext_cache is None or self._ext_cache[0] != ext_string:
+            self._ext_cache = (
+                ext_string, frozenset(self.get_file_extensions())
+            )
+        return self._ext_cache[1]
+
     def should_process_file(self, file_path: str) -> bool:
         """Check if file should be processed based on extension."""
         ext = os.path.splitext(file_path)[1].upper()
-        return ext in self.get_file_extensions()
+        return ext in self.get_extension_set()
+
+    def scan_source(self, root: str, extensions: FrozenSet[str]):
+        """
+        Recursively yield DirEntry objects under root whose extension is in
+        extensions. Uses os.scandir so the filter runs on entry names without
+        extra stats, and callers can reuse each entry's cached stat().
+        """
+        try:
+            entries = os.scandir(root)
+        except OSError as e:
+            print(f"Error scanning {root}: {e}")
+            return
+
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    # Match os.walk: don't descend into symlinked folders
+                    if not entry.is_symlink():
+                        yield from self.scan_source(entry.path, extensions)
+                elif os.path.splitext(entry.name)[1].upper() in extensions:
+                    yield entry
 
     def find_or_create_session(self, destination_root: str, year_folder: str,
                                month_folder: str,
                                session_name: str) -> str:
         """
         Find or create a Capture One session folder.
-        Returns the path to the session folder.
+        Returns the path to the session folder. Sessions already resolved
+        during the current ingest are returned without touching the disk.
+        """
+        key = (destination_root, year_folder, month_folder, session_name)
+        session_path = self._session_cache.get(key)
+        if session_path is None:
+            session_path = self._prepare_session(
+                destination_root, year_folder, month_folder, session_name
+            )
+            self._session_cache[key] = session_path
+        return session_path
+
+    def get_template_snapshot(self, template_path: str) -> io.BytesIO:
+        """
+        Return an in-memory tar archive of the session template.
+        The template is read from disk once and reused for every new session.
+        Symlinks are stored as the files they point to, as copytree did.
         """
+        cached = self._template_tar
+        if cached is None or cached[0] != template_path:
+            snapshot = io.BytesIO()
+            with tarfile.open(fileobj=snapshot, mode='w',
+                              dereference=True) as tar:
+                tar.add(template_path, arcname='.')
+            self._template_tar = (template_path, snapshot)
+        return self._template_tar[1]
+
+    def _prepare_session(self, destination_root: str, year_folder: str,
+                         month_folder: str, session_name: str) -> str:
+        """Ensure the session folder and its Capture folder exist on disk."""
         session_path = os.path.join(
             destination_root, year_folder, month_folder, session_name
         )
@@ -181,12 +502,20 @@ class HopperLogic:
             return session_path
 
         # Copy template
+        created = False
         try:
-            # Create parent directories
-            os.makedirs(os.path.dirname(session_path), exist_ok=True)
-
-            # Copy template folder
-            shutil.copytree(template_path, session_path)
+            # Create session directory (and parents)
+            os.makedirs(session_path)
+            created = True
+
+            # Unpack template snapshot
+            template_tar = self.get_template_snapshot(template_path)
+            template_tar.seek(0)
+            with tarfile.open(fileobj=template_tar) as tar:
+                if hasattr(tarfile, 'data_filter'):
+                    tar.extractall(session_path, filter='data')
+                else:
+                    tar.extractall(session_path)
 
             # Find and rename .cosessiondb file
             for item in os.listdir(session_path):
@@ -203,17 +532,96 @@ class HopperLogic:
             return session_path
         except Exception as e:
             print(f"Error creating session from template: {e}")
+            # Drop a half-extracted template so it can't shadow the fallback
+            if created:
+                shutil.rmtree(session_path, ignore_errors=True)
             # Fallback to basic structure
             os.makedirs(capture_path, exist_ok=True)
             Path(session_db).touch()
             return session_path
 
-    def ingest_files(self, log_callback=None,
-                     progress_callback=None) -> Tuple[int, int, List[str]]:
+    def move_file(self, source: str, destination: str) -> None:
+        """
+        Move a file, renaming in place when both paths are on one volume.
+        Falls back to copy + delete across devices.
+        """
+        try:
+            os.rename(source, destination)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            self.copy_file(source, destination)
+            try:
+                os.remove(source)
+            except OSError as e:
+                raise SourceNotRemovedError(
+                    f"Copied, but could not delete original: {e}"
+                ) from e
+
+    def copy_file(self, source: str, destination: str) -> None:
+        """
+        Copy file contents and metadata, removing a partial copy on failure.
+        shutil.copyfile already uses sendfile/fcopyfile on Linux and macOS;
+        elsewhere the buffered loop is run with a larger chunk size.
+        """
+        try:
+            if os.name == 'nt':
+                with open(source, 'rb') as fsrc, \
+                        open(destination, 'wb') as fdst:
+                    shutil.copyfileobj(fsrc, fdst, self.COPY_BUFFER_SIZE)
+            else:
+                shutil.copyfile(source, destination)
+            shutil.copystat(source, destination)
+        except BaseException:
+            try:
+                os.remove(destination)
+            except OSError:
+                pass
+            raise
+
+    def _claim_destination(self, capture_folder: str, filename: str) -> str:
+        """
+        Pick a free filename in capture_folder and reserve it.
+        The folder is listed once per ingest and collisions are resolved
+        against that snapshot, so it must only be called from one thread.
+        Names are compared case-insensitively to stay safe on Windows and
+        macOS volumes.
+        """
+        contents = self._capture_contents.get(capture_folder)
+        if contents is None:
+            contents = {name.lower() for name in os.listdir(capture_folder)}
+            self._capture_contents[capture_folder] = contents
+
+        # Handle duplicate filenames
+        if filename.lower() in contents:
+            base, ext = os.path.splitext(filename)
+            max_attempts = 10000  # Prevent infinite loop
+            for counter in range(1, max_attempts):
+                candidate = f'{base}_{counter}{ext}'
+                if candidate.lower() not in contents:
+                    filename = candidate
+                    break
+            else:
+                raise Exception("Too many duplicate filenames")
+
+        contents.add(filename.lower())
+        return filename
+
+    def ingest_files(self, log_callback=None, progress_callback=None,
+                     stop_event: Optional[threading.Event] = None
+                     ) -> Tuple[int, int, List[str]]:
         """
         Main ingestion logic.
+        Setting stop_event skips all queued work; moves already running
+        are allowed to finish.
         Returns: (success_count, fail_count, error_messages)
+        After a stop, files that were skipped count as neither success nor
+        failure and stay on the source, so the totals can add up to fewer
+        than the files found.
         """
+        if stop_event is None:
+            stop_event = threading.Event()
+
         source_path = self.config['source_path']
         volume_label = self.config['destination_volume_label']
 
@@ -239,80 +647,174 @@ class HopperLogic:
                 f"Destination: {destination_drive} (Volume: {volume_label})"
             )
 
+        # Sessions and the template may have changed since the last run
+        self._session_cache = {}
+        self._capture_contents = {}
+        self._template_tar = None
+
         # Get all files to process
+        extensions = self.get_extension_set()
         files_to_process = []
-        for root, dirs, files in os.walk(source_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if self.should_process_file(file_path):
-                    files_to_process.append(file_path)
+        skipped = 0
+        for entry in self.scan_source(source_path, extensions):
+            # Skip files already ingested by an earlier run
+            try:
+                if self.ledger_key(entry) in self._ledger:
+                    skipped += 1
+                    continue
+            except OSError:
+                pass  # Reported as a failure when the file is processed
+            files_to_process.append(entry)
 
         total_files = len(files_to_process)
         if log_callback:
             log_callback(f"Found {total_files} files to process")
-
-        # Process each file
-        for idx, file_path in enumerate(files_to_process):
-            try:
-                # Get date from EXIF
-                date = self.get_exif_date(file_path)
-                if not date:
-                    raise Exception("Could not determine file date")
-
-                # Construct destination path
-                year_folder, month_folder, session_name = (
-                    self.construct_path(date)
-                )
-
-                # Find or create session
-                session_path = self.find_or_create_session(
-                    destination_drive, year_folder, month_folder, session_name
-                )
-
-                # Check if session creation was successful
-                if not session_path:
-                    raise Exception("Failed to create session folder")
-
-                # Move file to Capture folder
-                capture_folder = os.path.join(session_path, 'Capture')
-                dest_file = os.path.join(
-                    capture_folder, os.path.basename(file_path)
-                )
-
-                # Handle duplicate filenames
-                if os.path.exists(dest_file):
-                    base, ext = os.path.splitext(os.path.basename(file_path))
-                    counter = 1
-                    max_attempts = 10000  # Prevent infinite loop
-                    while os.path.exists(dest_file) and counter < max_attempts:
-                        dest_file = os.path.join(
-                            capture_folder, f'{base}_{counter}{ext}'
-                        )
-                        counter += 1
-                    if counter >= max_attempts:
-                        raise Exception("Too many duplicate filenames")
-
-                shutil.move(file_path, dest_file)
+            if skipped:
+                log_callback(f"Skipped {skipped} previously ingested files")
+
+        max_workers = min(8, (os.cpu_count() or 1) * 2)
+        sep = os.sep
+        done = 0
+        last_progress = 0.0
+
+        def record_result(basename: str, error: Optional[Exception] = None,
+                          session_name: str = ''):
+            """Count, log and report progress for one finished file."""
+            nonlocal success_count, fail_count, done, last_progress
+            if error is None:
                 success_count += 1
-
                 if log_callback:
-                    basename = os.path.basename(file_path)
                     log_callback(
                         f"✓ Moved: {basename} -> {session_name}/Capture"
                     )
-
-            except Exception as e:
+            elif isinstance(error, SourceNotRemovedError):
+                # The copy is in place, so this counts as ingested
+                success_count += 1
+                if log_callback:
+                    log_callback(
+                        f"⚠ Copied: {basename} -> {session_name}/Capture"
+                        f" - {str(error)}"
+                    )
+            else:
                 fail_count += 1
-                basename = os.path.basename(file_path)
-                error_msg = f"✗ Failed: {basename} - {str(e)}"
+                error_msg = f"✗ Failed: {basename} - {str(error)}"
                 errors.append(error_msg)
                 if log_callback:
                     log_callback(error_msg)
 
-            # Update progress
+            # Update progress, throttled but always reporting the end
+            done += 1
             if progress_callback:
-                progress = ((idx + 1) / total_files) * 100
-                progress_callback(progress)
+                progress = (done / total_files) * 100
+                now = time.monotonic()
+                if (progress >= 100
+                        or now - last_progress >= self.PROGRESS_INTERVAL):
+                    last_progress = now
+                    progress_callback(progress)
+
+        def plan_one(entry: os.DirEntry) -> Tuple[str, str, str]:
+            """Work out the (year, month, session) destination of a file."""
+            if stop_event.is_set():
+                raise CancelledError()
+            # Get date from EXIF, reusing the stat cached on the entry
+            date = self.get_exif_date(entry.path, stat_result=entry.stat())
+            if not date:
+                raise Exception("Could not determine file date")
+            return self.construct_path(date)
+
+        def dispatch_move(entry: os.DirEntry, key: Tuple[str, str, str],
+                          executor: ThreadPoolExecutor) -> Future:
+            """Resolve the session and a free name, then submit the move."""
+            year_folder, month_folder, session_name = key
+            session_path = self.find_or_create_session(
+                destination_drive, year_folder, month_folder, session_name
+            )
+            # Check if session creation was successful
+            if not session_path:
+                raise Exception("Failed to create session folder")
+
+            # Move file to Capture folder, renaming on collision. Plain
+            # concatenation is safe here: neither part ends with a separator
+            capture_folder = f'{session_path}{sep}Capture'
+            dest_name = self._claim_destination(capture_folder, entry.name)
+            dest_file = f'{capture_folder}{sep}{dest_name}'
+            return executor.submit(move_one, entry.path, dest_file)
+
+        def move_one(source: str, destination: str) -> None:
+            """Move a file unless the ingest was stopped while it queued."""
+            if stop_event.is_set():
+                raise CancelledError()
+            self.move_file(source, destination)
+
+        # Two-stage pipeline: a deep pool reads EXIF headers (small random
+        # reads) while a smaller pool moves files (large sequential writes),
+        # so a file starts moving as soon as its date is known. Finished
+        # futures of both stages are funnelled through one queue to this
+        # thread, which owns the callbacks, counters, session creation and
+        # duplicate-name resolution. At most PIPELINE_DEPTH files are in
+        # flight, so stopping never leaves a long backlog in the pools.
+        finished = queue.Queue()
+        stage = {}
+        pending = iter(files_to_process)
+        stopped = False
+        with ThreadPoolExecutor(max_workers=self.EXIF_WORKERS) as readers, \
+                ThreadPoolExecutor(max_workers=max_workers) as movers:
+            while True:
+                # Top up the pipeline with new header reads
+                while not stop_event.is_set() and (
+                        len(stage) < self.PIPELINE_DEPTH):
+                    entry = next(pending, None)
+                    if entry is None:
+                        break
+                    future = readers.submit(plan_one, entry)
+                    stage[future] = ('plan', entry, None)
+                    future.add_done_callback(finished.put)
+
+                if stop_event.is_set() and not stopped:
+                    # Same effect as shutdown(cancel_futures=True), which
+                    # needs Python 3.9; running moves are still collected
+                    stopped = True
+                    for future in list(stage):
+                        if future.cancel():
+                            del stage[future]
+                    if log_callback:
+                        log_callback("Ingestion stopped")
+
+                if not stage:
+                    break
+
+                try:
+                    future = finished.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                if future.cancelled():
+                    continue
+                kind, entry, session_name = stage.pop(future)
+                if kind == 'plan' and stop_event.is_set():
+                    continue
+                try:
+                    if kind == 'plan':
+                        key = future.result()
+                        move = dispatch_move(entry, key, movers)
+                        stage[move] = ('move', entry, key[2])
+                        move.add_done_callback(finished.put)
+                    else:
+                        future.result()
+                        self._ledger[self.ledger_key(entry)] = None
+                        record_result(entry.name, session_name=session_name)
+                except CancelledError:
+                    # Skipped by a stop; the file stays where it is
+                    continue
+                except SourceNotRemovedError as e:
+                    # Remember it so the next run doesn't copy it again
+                    self._ledger[self.ledger_key(entry)] = None
+                    record_result(entry.name, e, session_name)
+                except Exception as e:
+                    record_result(entry.name, e)
+
+        self.save_exif_cache()
+        self.save_ledger()
 
         return success_count, fail_count, errors
 
@@ -320,12 +822,22 @@ class HopperLogic:
 class HopperUI:
     """Tkinter GUI for RAW_HOPPER."""
 
-    def __init__(self, root: tk.Tk, logic: HopperLogic):
+    def __init__(self, root: 'tk.Tk', logic: HopperLogic):
+        _import_tkinter()
         self.root = root
         self.logic = logic
         self.root.title("RAW_HOPPER v1.0")
         self.root.geometry("800x600")
 
+        # Worker threads must not touch Tk widgets directly; log messages
+        # and progress are handed over here and drained by the Tk thread
+        self._log_queue = queue.Queue(maxsize=1000)
+        self._pending_progress = None
+
+        # Set when the window closes so a running ingest stops queueing work
+        self._stop_event = threading.Event()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Create notebook for tabs
         self.notebook = ttk.Notebook(root)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
@@ -344,6 +856,9 @@ class HopperUI:
         # Load saved config into UI
         self.load_config_to_ui()
 
+        # Start applying queued worker output on the Tk thread
+        self.root.after(50, self._drain_ui_updates)
+
     def build_ingest_tab(self):
         """Build the INGEST tab."""
         # Drop zone style area
@@ -510,6 +1025,18 @@ class HopperUI:
             ext_frame, textvariable=self.extensions_var, width=50
         ).grid(row=0, column=1, padx=5, pady=5, sticky='w')
 
+        # Date source
+        date_frame = ttk.LabelFrame(
+            scrollable_frame, text="Date Source", padding=10
+        )
+        date_frame.pack(fill='x', padx=10, pady=5)
+
+        self.use_mtime_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            date_frame, variable=self.use_mtime_var,
+            text="Use file modification time only (skip EXIF, faster)"
+        ).grid(row=0, column=0, sticky='w', pady=5)
+
         # Save button
         save_btn = ttk.Button(
             scrollable_frame, text="Save Configuration",
@@ -541,7 +1068,7 @@ class HopperUI:
 
     def refresh_drives(self):
         """Refresh the list of available drives."""
-        drives = self.logic.get_drives()
+        drives = self.logic.get_drives(use_cache=False)
         volume_labels = [label for _, label in drives]
         self.volume_combo['values'] = volume_labels
 
@@ -572,6 +1099,9 @@ class HopperUI:
         # Extensions
         self.extensions_var.set(config.get('file_extensions', '.RAF, .JPG'))
 
+        # Date source
+        self.use_mtime_var.set(bool(config.get('use_mtime_only', False)))
+
     def save_config_from_ui(self):
         """Save configuration from UI to config file."""
         self.logic.config['destination_volume_label'] = self.volume_var.get()
@@ -580,34 +1110,85 @@ class HopperUI:
         self.logic.config['month_format'] = self.month_format_var.get()
         self.logic.config['session_format'] = self.session_format_var.get()
         self.logic.config['file_extensions'] = self.extensions_var.get()
+        self.logic.config['use_mtime_only'] = self.use_mtime_var.get()
 
         self.logic.save_config()
         messagebox.showinfo("Success", "Configuration saved successfully!")
 
     def log(self, message: str):
-        """Add message to log window."""
-        self.log_text.config(state='normal')
-        self.log_text.insert('end', message + '\n')
-        self.log_text.see('end')
-        self.log_text.config(state='disabled')
-        self.root.update_idletasks()
+        """Queue message for the log window. Safe to call from any thread."""
+        self._log_queue.put(message)
 
     def update_progress(self, value: float):
-        """Update progress bar."""
-        self.progress_bar['value'] = value
-        self.root.update_idletasks()
+        """Queue progress bar update. Safe to call from any thread."""
+        # Only the latest value matters, so updates are coalesced
+        self._pending_progress = value
+
+    def _drain_ui_updates(self):
+        """
+        Apply queued log messages and progress on the Tk thread.
+        A callable on the queue runs after the messages queued before it.
+        """
+        messages = []
+        callback = None
+        try:
+            while len(messages) < 64:
+                item = self._log_queue.get_nowait()
+                if callable(item):
+                    callback = item
+                    break
+                messages.append(item)
+        except queue.Empty:
+            pass
+
+        if messages:
+            self.log_text.config(state='normal')
+            self.log_text.insert('end', '\n'.join(messages) + '\n')
+            self.log_text.see('end')
+            self.log_text.config(state='disabled')
+
+        progress = self._pending_progress
+        if progress is not None:
+            self._pending_progress = None
+            self.progress_bar['value'] = progress
+
+        self.root.after(50, self._drain_ui_updates)
+
+        if callback is not None:
+            callback()
+
+    def finish_run(self, kind: str, title: str, message: str):
+        """Report the end of an ingest and re-enable the run button."""
+        self.run_btn.config(state='normal')
+        if kind == 'info':
+            messagebox.showinfo(title, message)
+        elif kind == 'warning':
+            messagebox.showwarning(title, message)
+        else:
+            messagebox.showerror(title, message)
+
+    def on_close(self):
+        """Stop any running ingest and close the window."""
+        self._stop_event.set()
+        self.root.destroy()
 
     def run_hopper(self):
         """Execute the ingestion process."""
         # Save current config
         self.save_config_from_ui()
 
-        # Clear log
+        # Drop anything still queued from a previous run, then clear log
+        try:
+            while True:
+                self._log_queue.get_nowait()
+        except queue.Empty:
+            pass
         self.log_text.config(state='normal')
         self.log_text.delete(1.0, 'end')
         self.log_text.config(state='disabled')
 
         # Reset progress
+        self._pending_progress = None
         self.progress_bar['value'] = 0
 
         # Disable run button
@@ -619,7 +1200,8 @@ class HopperUI:
                 self.log("Starting ingestion...")
                 success, fail, errors = self.logic.ingest_files(
                     log_callback=self.log,
-                    progress_callback=self.update_progress
+                    progress_callback=self.update_progress,
+                    stop_event=self._stop_event
                 )
 
                 self.log("\n" + "="*50)
@@ -629,27 +1211,31 @@ class HopperUI:
 
                 if fail == 0:
                     msg = f"Successfully processed {success} files!"
-                    messagebox.showinfo("Complete", msg)
+                    result = ('info', "Complete", msg)
                 else:
                     msg = (
                         f"Processed {success} files, {fail} failed. "
                         "Check log for details."
                     )
-                    messagebox.showwarning("Complete with errors", msg)
+                    result = ('warning', "Complete with errors", msg)
             except Exception as e:
                 self.log(f"\nERROR: {str(e)}")
-                messagebox.showerror("Error", f"Ingestion failed: {str(e)}")
-            finally:
-                self.run_btn.config(state='normal')
+                result = ('error', "Error", f"Ingestion failed: {str(e)}")
+
+            # Widgets belong to the Tk thread; queueing the completion
+            # also shows it only after the log lines above are drained
+            self._log_queue.put(lambda: self.finish_run(*result))
 
-        # Use daemon thread so app can close cleanly
-        # File operations (shutil.move) are atomic and won't corrupt
+        # Use daemon thread so closing the window doesn't wait on it.
+        # on_close sets the stop event: queued reads and moves are skipped
+        # and only moves already running finish before the process exits
         thread = threading.Thread(target=run_thread, daemon=True)
         thread.start()
 
 
 def main():
     """Main entry point."""
+    _import_tkinter()
     root = tk.Tk()
     logic = HopperLogic()
     HopperUI(root, logic)